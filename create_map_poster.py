@@ -21,16 +21,20 @@ high-quality poster-ready images with roads, water features, and parks.
 """
 
 import argparse
-import asyncio
 import json
+import multiprocessing
 import os
 import pickle
+import sqlite3
 import sys
+import threading
 import time
 import gc  # Garbage collection for memory management
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import cast
+from typing import TYPE_CHECKING, Any, Callable, cast
 
 # Workaround for PyInstaller: Mock package metadata if not available
 import sys
@@ -51,19 +55,31 @@ if getattr(sys, 'frozen', False):
     except:
         pass
 
+import matplotlib
 import matplotlib.colors as mcolors
-import matplotlib.pyplot as plt
 import numpy as np
-import osmnx as ox
-from geopandas import GeoDataFrame
+import shapely
+from geopy.adapters import BaseAsyncAdapter
 from geopy.geocoders import Nominatim
 from lat_lon_parser import parse
 from font_management import load_fonts
 from matplotlib.font_manager import FontProperties
-from networkx import MultiDiGraph
-from shapely.geometry import Point
+from pyproj import Transformer
 from tqdm import tqdm
 
+# osmnx, geopandas and pyplot take most of the import time, so they are
+# imported where they are used and --help / --list-themes stay fast
+if TYPE_CHECKING:
+    from geopandas import GeoDataFrame
+    from networkx import MultiDiGraph
+
+# orjson is an optional, faster drop-in for reading theme files
+json_loads: Callable[[str | bytes], Any]
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 
 class CacheError(Exception):
     """Raised when a cache operation fails."""
@@ -73,27 +89,52 @@ class CacheError(Exception):
 
 CACHE_DIR_PATH = os.environ.get("CACHE_DIR", "cache")
 CACHE_DIR = Path(CACHE_DIR_PATH)
-CACHE_DIR.mkdir(exist_ok=True)
 
 THEMES_DIR = "themes"
 FONTS_DIR = "fonts"
 POSTERS_DIR = "posters"
 
+# Create output/cache directories once instead of checking on every call
+CACHE_DIR.mkdir(parents=True, exist_ok=True)
+Path(POSTERS_DIR).mkdir(parents=True, exist_ok=True)
+
+# zlib level for PNG output: 1 is several times faster than Pillow's
+# default of 6 and only slightly larger for flat-colored posters
+PNG_COMPRESS_LEVEL = 1
+
 FONTS = load_fonts()
 
+# One shared geocoder; whether it is async is fixed by its adapter, so
+# decide once here instead of inspecting every result
+GEOLOCATOR = Nominatim(user_agent="city_map_poster", timeout=10)
+GEOCODER_IS_ASYNC = isinstance(GEOLOCATOR.adapter, BaseAsyncAdapter)
+
+
+CACHE_DB_PATH = CACHE_DIR / "cache.sqlite"
+
+_cache_db = None
+_cache_lock = threading.Lock()
+
 
-def _cache_path(key: str) -> str:
+def _get_cache_db() -> sqlite3.Connection:
     """
-    Generate a safe cache file path from a cache key.
+    Open the SQLite key/value store backing the cache, once per process.
 
-    Args:
-        key: Cache key identifier
+    All entries live in a single WAL-mode database instead of one pickle
+    file per key, so lookups cost one indexed query rather than a
+    stat/open/close round-trip each.
 
     Returns:
-        Path to cache file with .pkl extension
+        Shared sqlite3 connection
     """
-    safe = key.replace(os.sep, "_")
-    return os.path.join(CACHE_DIR, f"{safe}.pkl")
+    global _cache_db
+    if _cache_db is None:
+        db = sqlite3.connect(CACHE_DB_PATH, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("CREATE TABLE IF NOT EXISTS kv (k TEXT PRIMARY KEY, v BLOB NOT NULL)")
+        _cache_db = db
+    return _cache_db
 
 
 def cache_get(key: str):
@@ -110,11 +151,11 @@ def cache_get(key: str):
         CacheError: If cache read operation fails
     """
     try:
-        path = _cache_path(key)
-        if not os.path.exists(path):
+        with _cache_lock:
+            row = _get_cache_db().execute("SELECT v FROM kv WHERE k = ?", (key,)).fetchone()
+        if row is None:
             return None
-        with open(path, "rb") as f:
-            return pickle.load(f)
+        return pickle.loads(row[0])
     except Exception as e:
         raise CacheError(f"Cache read failed: {e}") from e
 
@@ -131,11 +172,9 @@ def cache_set(key: str, value):
         CacheError: If cache write operation fails
     """
     try:
-        if not os.path.exists(CACHE_DIR):
-            os.makedirs(CACHE_DIR)
-        path = _cache_path(key)
-        with open(path, "wb") as f:
-            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with _cache_lock:
+            _get_cache_db().execute("INSERT OR REPLACE INTO kv (k, v) VALUES (?, ?)", (key, blob))
     except Exception as e:
         raise CacheError(f"Cache write failed: {e}") from e
 
@@ -154,35 +193,33 @@ def is_latin_script(text):
     if not text:
         return True
 
-    latin_count = 0
-    total_alpha = 0
+    # One uint32 per character; only the letter test needs Python per char.
+    # surrogatepass keeps lone surrogates (e.g. undecodable argv bytes) as
+    # their own code point instead of raising
+    codepoints = np.frombuffer(text.encode("utf-32-le", errors="surrogatepass"), dtype=np.uint32)
+    alpha_mask = np.fromiter((char.isalpha() for char in text), dtype=bool, count=len(text))
 
-    for char in text:
-        if char.isalpha():
-            total_alpha += 1
-            # Latin Unicode ranges:
-            # - Basic Latin: U+0000 to U+007F
-            # - Latin-1 Supplement: U+0080 to U+00FF
-            # - Latin Extended-A: U+0100 to U+017F
-            # - Latin Extended-B: U+0180 to U+024F
-            if ord(char) < 0x250:
-                latin_count += 1
+    total_alpha = np.count_nonzero(alpha_mask)
 
     # If no alphabetic characters, default to Latin (numbers, symbols, etc.)
     if total_alpha == 0:
         return True
 
+    # Latin Unicode ranges:
+    # - Basic Latin: U+0000 to U+007F
+    # - Latin-1 Supplement: U+0080 to U+00FF
+    # - Latin Extended-A: U+0100 to U+017F
+    # - Latin Extended-B: U+0180 to U+024F
+    latin_count = np.count_nonzero(codepoints[alpha_mask] < 0x250)
+
     # Consider it Latin if >80% of alphabetic characters are Latin
-    return (latin_count / total_alpha) > 0.8
+    return bool((latin_count / total_alpha) > 0.8)
 
 
 def generate_output_filename(city, theme_name, output_format):
     """
     Generate unique output filename with city, theme, and datetime.
     """
-    if not os.path.exists(POSTERS_DIR):
-        os.makedirs(POSTERS_DIR)
-
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     city_slug = city.lower().replace(" ", "_")
     ext = output_format.lower()
@@ -190,25 +227,26 @@ def generate_output_filename(city, theme_name, output_format):
     return os.path.join(POSTERS_DIR, filename)
 
 
+@lru_cache(maxsize=None)
 def get_available_themes():
     """
     Scans the themes directory and returns a list of available theme names.
+    The result is cached for the process and must not be modified; theme
+    files added later only show up after a restart (e.g. of the web app).
     """
     if not os.path.exists(THEMES_DIR):
         os.makedirs(THEMES_DIR)
         return []
 
-    themes = []
-    for file in sorted(os.listdir(THEMES_DIR)):
-        if file.endswith(".json"):
-            theme_name = file[:-5]  # Remove .json extension
-            themes.append(theme_name)
-    return themes
+    return sorted(path.stem for path in Path(THEMES_DIR).glob("*.json"))
 
 
+@lru_cache(maxsize=None)
 def load_theme(theme_name="terracotta"):
     """
     Load theme from JSON file in themes directory.
+    The result is cached per theme name and must not be modified; edits
+    to a theme file only take effect after a restart (e.g. of the web app).
     """
     theme_file = os.path.join(THEMES_DIR, f"{theme_name}.json")
 
@@ -231,8 +269,8 @@ def load_theme(theme_name="terracotta"):
             "road_default": "#D9A08A",
         }
 
-    with open(theme_file, "r") as f:
-        theme = json.load(f)
+    with open(theme_file, "rb") as f:
+        theme = json_loads(f.read())
         print(f"[OK] Loaded theme: {theme.get('name', theme_name)}")
         if "description" in theme:
             print(f"  {theme['description']}")
@@ -242,31 +280,40 @@ def load_theme(theme_name="terracotta"):
 # Load theme (can be changed via command line or input)
 THEME = dict[str, str]()  # Will be loaded later
 
+# Parsed command-line arguments (set by main)
+args = argparse.Namespace()
 
-def create_gradient_fade(ax, color, location="bottom", zorder=10):
+
+@lru_cache(maxsize=32)
+def _gradient_image(color, location):
     """
-    Creates a fade effect at the top or bottom of the map.
+    Builds (and memoizes) the fade as a 256x1 uint8 RGBA image: a solid
+    color with an alpha ramp. Drawing RGBA bytes directly skips the float
+    colormap/normalize pass in matplotlib's image pipeline.
     """
-    vals = np.linspace(0, 1, 256).reshape(-1, 1)
-    gradient = np.hstack((vals, vals))
+    if location == "bottom":
+        alpha = np.linspace(255, 0, 256)
+    else:
+        alpha = np.linspace(0, 255, 256)
 
-    rgb = mcolors.to_rgb(color)
-    my_colors = np.zeros((256, 4))
-    my_colors[:, 0] = rgb[0]
-    my_colors[:, 1] = rgb[1]
-    my_colors[:, 2] = rgb[2]
+    image = np.empty((256, 1, 4), dtype=np.uint8)
+    image[:, :, :3] = np.round(np.array(mcolors.to_rgb(color)) * 255)
+    image[:, 0, 3] = np.round(alpha)
+    image.flags.writeable = False
+    return image
 
+
+def create_gradient_fade(ax, color, location="bottom", zorder=10):
+    """
+    Creates a fade effect at the top or bottom of the map.
+    """
     if location == "bottom":
-        my_colors[:, 3] = np.linspace(1, 0, 256)
         extent_y_start = 0
         extent_y_end = 0.25
     else:
-        my_colors[:, 3] = np.linspace(0, 1, 256)
         extent_y_start = 0.75
         extent_y_end = 1.0
 
-    custom_cmap = mcolors.ListedColormap(my_colors)
-
     xlim = ax.get_xlim()
     ylim = ax.get_ylim()
     y_range = ylim[1] - ylim[0]
@@ -275,77 +322,82 @@ def create_gradient_fade(ax, color, location="bottom", zorder=10):
     y_top = ylim[0] + y_range * extent_y_end
 
     ax.imshow(
-        gradient,
+        _gradient_image(color, location),
         extent=[xlim[0], xlim[1], y_bottom, y_top],
         aspect="auto",
-        cmap=custom_cmap,
+        interpolation="nearest",
         zorder=zorder,
         origin="lower",
     )
 
 
-def get_edge_colors_by_type(g):
+def _edge_highway(data):
     """
-    Assigns colors to edges based on road type hierarchy.
-    Returns a list of colors corresponding to each edge in the graph.
+    Returns the highway tag of an edge, taking the first entry when OSM
+    provides a list of types.
     """
-    edge_colors = []
-
-    for _u, _v, data in g.edges(data=True):
-        # Get the highway type (can be a list or string)
-        highway = data.get('highway', 'unclassified')
-
-        # Handle list of highway types (take the first one)
-        if isinstance(highway, list):
-            highway = highway[0] if highway else 'unclassified'
-
-        # Assign color based on road type
-        if highway in ["motorway", "motorway_link"]:
-            color = THEME["road_motorway"]
-        elif highway in ["trunk", "trunk_link", "primary", "primary_link"]:
-            color = THEME["road_primary"]
-        elif highway in ["secondary", "secondary_link"]:
-            color = THEME["road_secondary"]
-        elif highway in ["tertiary", "tertiary_link"]:
-            color = THEME["road_tertiary"]
-        elif highway in ["residential", "living_street", "unclassified"]:
-            color = THEME["road_residential"]
-        else:
-            color = THEME['road_default']
-
-        edge_colors.append(color)
-
-    return edge_colors
-
-
-def get_edge_widths_by_type(g):
+    highway = data.get('highway', 'unclassified')
+    if isinstance(highway, list):
+        highway = highway[0] if highway else 'unclassified'
+    return highway
+
+
+# Road hierarchy: OSM highway tag -> (theme color key, line width).
+# Major roads get darker/thicker lines; anything unlisted uses the default.
+ROAD_HIERARCHY = {
+    "motorway": ("road_motorway", 1.2),
+    "motorway_link": ("road_motorway", 1.2),
+    "trunk": ("road_primary", 1.0),
+    "trunk_link": ("road_primary", 1.0),
+    "primary": ("road_primary", 1.0),
+    "primary_link": ("road_primary", 1.0),
+    "secondary": ("road_secondary", 0.8),
+    "secondary_link": ("road_secondary", 0.8),
+    "tertiary": ("road_tertiary", 0.6),
+    "tertiary_link": ("road_tertiary", 0.6),
+    "residential": ("road_residential", 0.4),
+    "living_street": ("road_residential", 0.4),
+    "unclassified": ("road_residential", 0.4),
+}
+DEFAULT_ROAD_STYLE = ("road_default", 0.4)
+
+
+def build_road_style_lut(theme):
     """
-    Assigns line widths to edges based on road type.
-    Major roads get thicker lines.
+    Resolves ROAD_HIERARCHY against a theme.
+    Returns ({highway: (color, width)}, default (color, width)).
     """
-    edge_widths = []
+    lut = {highway: (theme[key], width) for highway, (key, width) in ROAD_HIERARCHY.items()}
+    default_key, default_width = DEFAULT_ROAD_STYLE
+    return lut, (theme[default_key], default_width)
+
 
-    for _u, _v, data in g.edges(data=True):
-        highway = data.get('highway', 'unclassified')
+def get_edge_styles(g):
+    """
+    Assigns colors and line widths to edges based on road type hierarchy.
 
-        if isinstance(highway, list):
-            highway = highway[0] if highway else 'unclassified'
+    Walks the edges once to collect highway tags, classifies each distinct
+    tag a single time and broadcasts the result back to every edge.
 
-        # Assign width based on road importance
-        if highway in ["motorway", "motorway_link"]:
-            width = 1.2
-        elif highway in ["trunk", "trunk_link", "primary", "primary_link"]:
-            width = 1.0
-        elif highway in ["secondary", "secondary_link"]:
-            width = 0.8
-        elif highway in ["tertiary", "tertiary_link"]:
-            width = 0.6
-        else:
-            width = 0.4
+    Returns:
+        (colors, widths) lists in edge order
+    """
+    highways = np.fromiter(
+        (_edge_highway(data) for _u, _v, data in g.edges(data=True)),
+        dtype=object,
+        count=g.number_of_edges(),
+    )
+    if highways.size == 0:
+        return [], []
 
-        edge_widths.append(width)
+    unique_highways, inverse = np.unique(highways.astype(str), return_inverse=True)
+    lut, default = build_road_style_lut(THEME)
+    styles = [lut.get(h, default) for h in unique_highways]
+    color_lut = np.array([color for color, _width in styles], dtype=object)
+    width_lut = np.array([width for _color, width in styles], dtype=float)
 
-    return edge_widths
+    # ox.plot_graph only treats real sequences as per-edge values
+    return color_lut[inverse].tolist(), width_lut[inverse].tolist()
 
 
 def get_coordinates(city, country):
@@ -353,25 +405,28 @@ def get_coordinates(city, country):
     Fetches coordinates for a given city and country using geopy.
     Includes rate limiting to be respectful to the geocoding service.
     """
-    coords = f"coords_{city.lower()}_{country.lower()}"
+    # Normalize case and whitespace so "Paris " and "paris" share an entry
+    place = "_".join(" ".join(part.split()).lower() for part in (city, country))
+    coords = f"coords_{place}"
     cached = cache_get(coords)
     if cached:
         print(f"[OK] Using cached coordinates for {city}, {country}")
         return cached
 
     print("Looking up coordinates...")
-    geolocator = Nominatim(user_agent="city_map_poster", timeout=10)
 
-    # Add a small delay to respect Nominatim's usage policy
+    # Add a small delay to respect Nominatim's usage policy (cache misses only)
     time.sleep(1)
 
     try:
-        location = geolocator.geocode(f"{city}, {country}")
+        location = GEOLOCATOR.geocode(f"{city}, {country}")
     except Exception as e:
         raise ValueError(f"Geocoding failed for {city}, {country}: {e}") from e
 
-    # If geocode returned a coroutine in some environments, run it to get the result.
-    if asyncio.iscoroutine(location):
+    # An async adapter makes geocode return a coroutine; run it to get the result.
+    if GEOCODER_IS_ASYNC:
+        import asyncio
+
         try:
             location = asyncio.run(location)
         except RuntimeError as exc:
@@ -402,25 +457,25 @@ def get_coordinates(city, country):
     raise ValueError(f"Could not find coordinates for {city}, {country}")
 
 
-def get_crop_limits(g_proj, center_lat_lon, fig, dist):
+@lru_cache(maxsize=32)
+def _get_transformer(from_crs, to_crs) -> Transformer:
+    """
+    Return a memoized pyproj Transformer between two CRSs (x/y axis order).
+    """
+    return Transformer.from_crs(from_crs, to_crs, always_xy=True)
+
+
+def get_crop_limits(g_proj, center_lat_lon, width, height, dist):
     """
     Crop inward to preserve aspect ratio while guaranteeing
     full coverage of the requested radius.
     """
     lat, lon = center_lat_lon
 
-    # Project center point into graph CRS
-    center = (
-        ox.projection.project_geometry(
-            Point(lon, lat),
-            crs="EPSG:4326",
-            to_crs=g_proj.graph["crs"]
-        )[0]
-    )
-    center_x, center_y = center.x, center.y
+    # Project center point into graph CRS (Transformer is memoized per CRS)
+    center_x, center_y = _get_transformer("EPSG:4326", g_proj.graph["crs"]).transform(lon, lat)
 
-    fig_width, fig_height = fig.get_size_inches()
-    aspect = fig_width / fig_height
+    aspect = width / height
 
     # Start from the *requested* radius
     half_x = dist
@@ -438,42 +493,44 @@ def get_crop_limits(g_proj, center_lat_lon, fig, dist):
     )
 
 
-def fetch_graph(point, dist) -> MultiDiGraph | None:
+def fetch_graph(point, dist, network_type="all", log=print) -> "MultiDiGraph | None":
     """
     Fetch street network graph from OpenStreetMap.
 
-    Uses caching to avoid redundant downloads. Fetches all network types
-    within the specified distance from the center point.
+    Uses caching to avoid redundant downloads. Fetches the given network
+    type within the specified distance from the center point.
 
     Args:
         point: (latitude, longitude) tuple for center point
         dist: Distance in meters from center point
+        network_type: OSMnx network type ('all', 'drive', 'walk' or 'bike')
+        log: Callable receiving status messages (print by default)
 
     Returns:
         MultiDiGraph of street network, or None if fetch fails
     """
     lat, lon = point
-    graph = f"graph_{lat}_{lon}_{dist}"
+    graph = f"graph_{lat}_{lon}_{dist}_{network_type}"
     cached = cache_get(graph)
     if cached is not None:
-        print("[OK] Using cached street network")
-        return cast(MultiDiGraph, cached)
+        log("[OK] Using cached street network")
+        return cast("MultiDiGraph", cached)
+
+    import osmnx as ox
 
     try:
-        g = ox.graph_from_point(point, dist=dist, dist_type='bbox', network_type='all', truncate_by_edge=True)
-        # Rate limit between requests
-        time.sleep(0.5)
+        g = ox.graph_from_point(point, dist=dist, dist_type='bbox', network_type=network_type, truncate_by_edge=True)
         try:
             cache_set(graph, g)
         except CacheError as e:
-            print(e)
+            log(e)
         return g
     except Exception as e:
-        print(f"OSMnx error while fetching graph: {e}")
+        log(f"OSMnx error while fetching graph: {e}")
         return None
 
 
-def fetch_features(point, dist, tags, name) -> GeoDataFrame | None:
+def fetch_features(point, dist, tags, name, log=print) -> "GeoDataFrame | None":
     """
     Fetch geographic features (water, parks, etc.) from OpenStreetMap.
 
@@ -485,6 +542,7 @@ def fetch_features(point, dist, tags, name) -> GeoDataFrame | None:
         dist: Distance in meters from center point
         tags: Dictionary of OSM tags to filter features
         name: Name for this feature type (for caching and logging)
+        log: Callable receiving status messages (print by default)
 
     Returns:
         GeoDataFrame of features, or None if fetch fails
@@ -494,23 +552,271 @@ def fetch_features(point, dist, tags, name) -> GeoDataFrame | None:
     features = f"{name}_{lat}_{lon}_{dist}_{tag_str}"
     cached = cache_get(features)
     if cached is not None:
-        print(f"[OK] Using cached {name}")
-        return cast(GeoDataFrame, cached)
+        log(f"[OK] Using cached {name}")
+        return cast("GeoDataFrame", cached)
+
+    import osmnx as ox
 
     try:
         data = ox.features_from_point(point, tags=tags, dist=dist)
-        # Rate limit between requests
-        time.sleep(0.3)
         try:
             cache_set(features, data)
         except CacheError as e:
-            print(e)
+            log(e)
         return data
     except Exception as e:
-        print(f"OSMnx error while fetching features: {e}")
+        log(f"OSMnx error while fetching features: {e}")
         return None
 
 
+def project_graph(g, point, dist, network_type="all") -> "MultiDiGraph":
+    """
+    Project a street network graph to its local UTM CRS.
+
+    Projection pushes every node through pyproj, so the result is cached
+    next to the raw graph and re-rendering the same area (other themes,
+    fonts or sizes) skips it.
+
+    Args:
+        g: Unprojected street network from fetch_graph
+        point: (latitude, longitude) tuple the graph was fetched around
+        dist: Distance in meters the graph was fetched with
+        network_type: Network type the graph was fetched with
+
+    Returns:
+        Projected MultiDiGraph
+    """
+    lat, lon = point
+    graph = f"graph_proj_{lat}_{lon}_{dist}_{network_type}"
+    cached = cache_get(graph)
+    if cached is not None:
+        print("[OK] Using cached projected street network")
+        return cast("MultiDiGraph", cached)
+
+    import osmnx as ox
+
+    g_proj = ox.project_graph(g)
+    try:
+        cache_set(graph, g_proj)
+    except CacheError as e:
+        print(e)
+    return g_proj
+
+
+def project_features(features, g_proj, point, dist, name) -> "GeoDataFrame | None":
+    """
+    Keep only the polygon geometries of a feature layer and project them
+    into the graph's CRS.
+
+    Point features would otherwise show up as dots. All vertices go through
+    one shared Transformer in a single vectorized shapely.transform call,
+    and the projected polygons are cached under the raw features' location
+    key plus the target CRS, so graphs of different network types that
+    land in different UTM zones never share projected polygons.
+
+    Args:
+        features: GeoDataFrame from fetch_features, or None
+        g_proj: Projected street network whose CRS is the target
+        point: (latitude, longitude) tuple the features were fetched around
+        dist: Distance in meters the features were fetched with
+        name: Name for this feature type (for caching and logging)
+
+    Returns:
+        Projected polygon GeoDataFrame, or None if there is nothing to draw
+    """
+    if features is None or features.empty:
+        return None
+
+    lat, lon = point
+    target_crs = g_proj.graph["crs"]
+    projected = f"{name}_proj_{lat}_{lon}_{dist}_{target_crs}"
+    cached = cache_get(projected)
+    if cached is not None:
+        print(f"[OK] Using cached projected {name}")
+        return cast("GeoDataFrame", cached)
+
+    polys = features[features.geometry.type.isin(["Polygon", "MultiPolygon"])]
+    if polys.empty:
+        return None
+
+    from geopandas import GeoSeries
+
+    transformer = _get_transformer(polys.crs, target_crs)
+    geoms = shapely.transform(
+        polys.geometry.to_numpy(),
+        lambda xy: np.column_stack(transformer.transform(xy[:, 0], xy[:, 1])),
+    )
+    polys = polys.set_geometry(GeoSeries(geoms, index=polys.index, crs=target_crs))
+
+    try:
+        cache_set(projected, polys)
+    except CacheError as e:
+        print(e)
+    return polys
+
+
+def clip_to_view(polys, xlim, ylim) -> "GeoDataFrame | None":
+    """
+    Drop polygons whose bounding box falls entirely outside the crop window.
+
+    Uses the GeoDataFrame's R-tree spatial index, so matplotlib only
+    receives polygons that can actually end up on the poster. Original
+    row order (and therefore draw order) is preserved. Returns None when
+    nothing is in view, so the layer is skipped like a missing one.
+    """
+    window = shapely.box(xlim[0], ylim[0], xlim[1], ylim[1])
+    visible = np.sort(polys.sindex.query(window))
+    if visible.size == 0:
+        return None
+    return polys.iloc[visible]
+
+
+def _fetch_quietly(fn, fn_args):
+    """
+    Run a fetch on a worker thread, collecting its messages instead of
+    printing them. stdout may be redirected to something that is only
+    safe to use from the calling thread (the web app's progress log).
+
+    Returns:
+        (result, messages) tuple
+    """
+    messages = []
+    return fn(*fn_args, log=messages.append), messages
+
+
+def get_compensated_dist(dist, width, height):
+    """
+    Widen the fetch radius so the aspect-ratio crop still covers dist.
+    """
+    return dist * (max(height, width) / min(height, width)) / 4  # To compensate for viewport crop
+
+
+def fetch_map_data(point, dist, network_type="all", no_water=False, no_parks=False) -> dict:
+    """
+    Download every OSM layer a poster needs.
+
+    The street network, water and parks are independent Overpass queries,
+    so they are fetched concurrently. The result does not depend on the
+    theme, so --all-themes fetches it once and renders every theme from it.
+    The street network is always fetched because the crop window is
+    computed in its projected CRS, even when roads are hidden.
+
+    Args:
+        point: (latitude, longitude) tuple for map center
+        dist: Fetch distance in meters (see get_compensated_dist)
+        network_type: OSMnx network type for the street network
+        no_water: Skip the water query
+        no_parks: Skip the parks query
+
+    Returns:
+        Dict with "network_type", "graph", "water" and "parks" entries
+        (layers are None when skipped)
+
+    Raises:
+        RuntimeError: If street network data cannot be retrieved
+    """
+    layers: dict[str, tuple[Callable[..., Any], tuple]] = {
+        "street network": (fetch_graph, (point, dist, network_type)),
+    }
+    if not no_water:
+        layers["water features"] = (
+            fetch_features,
+            (point, dist, {"natural": "water", "waterway": "riverbank"}, "water"),
+        )
+    if not no_parks:
+        layers["parks/green spaces"] = (
+            fetch_features,
+            (point, dist, {"leisure": "park", "landuse": "grass"}, "parks"),
+        )
+
+    # Progress bar for data fetching
+    with tqdm(
+        total=len(layers),
+        desc="Fetching map data",
+        unit="step",
+        bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt}",
+    ) as pbar:
+        pbar.set_description("Downloading " + ", ".join(layers))
+        with ThreadPoolExecutor(max_workers=len(layers)) as executor:
+            futures = {executor.submit(_fetch_quietly, fn, fn_args): label for label, (fn, fn_args) in layers.items()}
+            results = {}
+            for future in as_completed(futures):
+                results[futures[future]], messages = future.result()
+                for message in messages:
+                    print(message)
+                pbar.set_description(f"Downloaded {futures[future]}")
+                pbar.update(1)
+
+    if results["street network"] is None:
+        raise RuntimeError("Failed to retrieve street network data.")
+
+    print("[OK] All data retrieved successfully!")
+
+    # Free up memory before rendering
+    gc.collect()
+
+    return {
+        "network_type": network_type,
+        "graph": results["street network"],
+        "water": results.get("water features"),
+        "parks": results.get("parks/green spaces"),
+    }
+
+
+def prepare_layers(map_data, point, width, height, dist):
+    """
+    Do the theme-independent part of rendering once.
+
+    Projects the street network and polygon layers into a metric CRS,
+    computes the crop window for the poster aspect ratio and drops
+    polygons outside it. The result only depends on location and poster
+    size, so --all-themes builds it once and every theme only draws.
+
+    Args:
+        map_data: Layers from fetch_map_data
+        point: (latitude, longitude) tuple for map center
+        width: Poster width in inches
+        height: Poster height in inches
+        dist: Fetch distance in meters (see get_compensated_dist)
+
+    Returns:
+        Dict with the projected "graph", clipped "water" and "parks"
+        polygons (None when empty or skipped) and the "xlim"/"ylim" crop
+    """
+    # Project graph to a metric CRS so distances and aspect are linear (meters)
+    g_proj = project_graph(map_data["graph"], point, dist, map_data["network_type"])
+
+    # Determine cropping limits to maintain the poster aspect ratio
+    crop_xlim, crop_ylim = get_crop_limits(g_proj, point, width, height, dist)
+
+    # Filter to only polygon/multipolygon geometries (not points) and crop them
+    polys = {}
+    for name in ("water", "parks"):
+        projected = project_features(map_data[name], g_proj, point, dist, name)
+        if projected is not None:
+            projected = clip_to_view(projected, crop_xlim, crop_ylim)
+        polys[name] = projected
+
+    return {
+        "graph": g_proj,
+        "water": polys["water"],
+        "parks": polys["parks"],
+        "xlim": crop_xlim,
+        "ylim": crop_ylim,
+    }
+
+
+@lru_cache(maxsize=64)
+def get_font_properties(**kwargs) -> FontProperties:
+    """
+    Return a memoized FontProperties for the given family/fname/weight/size.
+
+    Resolving a FontProperties goes through matplotlib's font manager; text
+    artists copy the object they are given, so sharing one is safe.
+    """
+    return FontProperties(**kwargs)
+
+
 def create_poster(
     city,
     country,
@@ -525,6 +831,9 @@ def create_poster(
     display_city=None,
     display_country=None,
     fonts=None,
+    dpi=300,
+    map_data=None,
+    layers=None,
 ):
     """
     Generate a complete map poster with roads, water, parks, and typography.
@@ -543,10 +852,18 @@ def create_poster(
         height: Poster height in inches (default: 16)
         country_label: Optional override for country text on poster
         _name_label: Optional override for city name (unused, reserved for future use)
+        dpi: Raster resolution for PNG output (default: 300)
+        map_data: Pre-fetched layers from fetch_map_data; fetched here if None
+        layers: Projected, cropped layers from prepare_layers; takes
+            precedence over map_data and is built here if None
 
     Raises:
         RuntimeError: If street network data cannot be retrieved
     """
+    import matplotlib.pyplot as plt
+    import osmnx as ox
+    from matplotlib.lines import Line2D
+
     # Handle display names for i18n support
     # Priority: display_city/display_country > name_label/country_label > city/country
     display_city = display_city or name_label or city
@@ -554,45 +871,20 @@ def create_poster(
 
     print(f"\nGenerating map for {city}, {country}...")
 
-    # Progress bar for data fetching
-    with tqdm(
-        total=3,
-        desc="Fetching map data",
-        unit="step",
-        bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt}",
-    ) as pbar:
-        # 1. Fetch Street Network
-        pbar.set_description("Downloading street network")
-        compensated_dist = dist * (max(height, width) / min(height, width)) / 4  # To compensate for viewport crop
-        g = fetch_graph(point, compensated_dist)
-        if g is None:
-            raise RuntimeError("Failed to retrieve street network data.")
-        pbar.update(1)
-
-        # 2. Fetch Water Features
-        pbar.set_description("Downloading water features")
-        water = fetch_features(
-            point,
-            compensated_dist,
-            tags={"natural": "water", "waterway": "riverbank"},
-            name="water",
-        )
-        pbar.update(1)
+    compensated_dist = get_compensated_dist(dist, width, height)
 
-        # 3. Fetch Parks
-        pbar.set_description("Downloading parks/green spaces")
-        parks = fetch_features(
-            point,
-            compensated_dist,
-            tags={"leisure": "park", "landuse": "grass"},
-            name="parks",
-        )
-        pbar.update(1)
-
-    print("[OK] All data retrieved successfully!")
-    
-    # Free up memory before rendering
-    gc.collect()
+    if layers is None:
+        if map_data is None:
+            map_data = fetch_map_data(
+                point,
+                compensated_dist,
+                network_type=args.network_type,
+                no_water=args.no_water,
+                no_parks=args.no_parks,
+            )
+        layers = prepare_layers(map_data, point, width, height, compensated_dist)
+    g_proj = layers["graph"]
+    crop_xlim, crop_ylim = layers["xlim"], layers["ylim"]
 
     # 2. Setup Plot
     print("Rendering map...")
@@ -600,43 +892,17 @@ def create_poster(
     ax.set_facecolor(THEME["bg"])
     ax.set_position((0.0, 0.0, 1.0, 1.0))
 
-    # Project graph to a metric CRS so distances and aspect are linear (meters)
-    g_proj = ox.project_graph(g)
-
     # 3. Plot Layers
-    # Layer 1: Polygons (filter to only plot polygon/multipolygon geometries, not points)
-    if water is not None and not water.empty:
-        # Filter to only polygon/multipolygon geometries to avoid point features showing as dots
-        water_polys = water[water.geometry.type.isin(["Polygon", "MultiPolygon"])]
-        if not water_polys.empty:
-            # Project water features in the same CRS as the graph
-            try:
-                water_polys = ox.projection.project_gdf(water_polys)
-            except Exception:
-                water_polys = water_polys.to_crs(g_proj.graph['crs'])
-            # Conditionally plot water
-            if not args.no_water:
-                water_polys.plot(ax=ax, facecolor=THEME['water'], edgecolor='none', zorder=0.5)
-
-    if parks is not None and not parks.empty:
-        # Filter to only polygon/multipolygon geometries to avoid point features showing as dots
-        parks_polys = parks[parks.geometry.type.isin(["Polygon", "MultiPolygon"])]
-        if not parks_polys.empty:
-            # Project park features in the same CRS as the graph
-            try:
-                parks_polys = ox.projection.project_gdf(parks_polys)
-            except Exception:
-                parks_polys = parks_polys.to_crs(g_proj.graph['crs'])
-            # Conditionally plot parks
-            if not args.no_parks:
-                parks_polys.plot(ax=ax, facecolor=THEME['parks'], edgecolor='none', zorder=0.8)
+    # Layer 1: Polygons
+    if layers["water"] is not None and not args.no_water:
+        layers["water"].plot(ax=ax, facecolor=THEME['water'], edgecolor='none', zorder=0.5)
+
+    if layers["parks"] is not None and not args.no_parks:
+        layers["parks"].plot(ax=ax, facecolor=THEME['parks'], edgecolor='none', zorder=0.8)
     # Layer 2: Roads with hierarchy coloring
     print("Applying road hierarchy colors...")
-    edge_colors = get_edge_colors_by_type(g_proj)
-    edge_widths = get_edge_widths_by_type(g_proj)
+    edge_colors, edge_widths = get_edge_styles(g_proj)
 
-    # Determine cropping limits to maintain the poster aspect ratio
-    crop_xlim, crop_ylim = get_crop_limits(g_proj, point, fig, compensated_dist)
     # Plot the projected graph and then apply the cropped limits
     # Conditionally plot roads
     if not args.no_roads:
@@ -670,15 +936,14 @@ def create_poster(
     active_fonts = fonts or FONTS
 # --- FORCED LOCAL FONTS & BIGGER SIZES ---
 # Use the font family from the GUI directly for all elements
-    font_main = FontProperties(family=args.font_family, weight="bold", size=BASE_MAIN * scale_factor)
-    font_sub = FontProperties(family=args.font_family, weight="normal", size=BASE_SUB * scale_factor)
-    font_coords = FontProperties(family=args.font_family, weight="normal", size=BASE_COORDS * scale_factor)
-# Attribution font (usually smaller)
-    font_attr = FontProperties(family="monospace", size=BASE_ATTR * scale_factor)
+    font_family = args.font_family
+    font_sub = get_font_properties(family=font_family, weight="normal", size=BASE_SUB * scale_factor)
+    font_coords = get_font_properties(family=font_family, weight="normal", size=BASE_COORDS * scale_factor)
     # Format city name based on script type
     # Latin scripts: apply uppercase and letter spacing for aesthetic
     # Non-Latin scripts (CJK, Thai, Arabic, etc.): no spacing, preserve case structure
-    if is_latin_script(display_city):
+    city_is_latin = is_latin_script(display_city)
+    if city_is_latin:
         # Latin script: uppercase with letter spacing (e.g., "P  A  R  I  S")
         spaced_city = "  ".join(list(display_city.upper()))
     else:
@@ -692,7 +957,7 @@ def create_poster(
     city_char_count = len(display_city)
     
     # For Latin scripts with letter spacing, the effective length is doubled
-    if is_latin_script(display_city):
+    if city_is_latin:
         effective_length = city_char_count * 2  # Account for letter spacing
     else:
         effective_length = city_char_count
@@ -711,8 +976,8 @@ def create_poster(
         adjusted_font_size = max(adjusted_font_size * 0.7, 6 * scale_factor)
 
     # Force the adjusted city font to use your local GUI selection
-    font_main_adjusted = FontProperties(
-        family=args.font_family, weight="bold", size=adjusted_font_size
+    font_main_adjusted = get_font_properties(
+        family=font_family, weight="bold", size=adjusted_font_size
     )
        
     
@@ -764,20 +1029,23 @@ def create_poster(
         zorder=11,
     )
 
-    ax.plot(
-        [0.4, 0.6],
-        [0.120, 0.120],
-        transform=ax.transAxes,
-        color=THEME["text"],
-        linewidth=1 * scale_factor,
-        zorder=11,
+    # Divider is in axes coordinates, so add it directly and skip autoscaling
+    ax.add_line(
+        Line2D(
+            [0.4, 0.6],
+            [0.120, 0.120],
+            transform=ax.transAxes,
+            color=THEME["text"],
+            linewidth=1 * scale_factor,
+            zorder=11,
+        )
     )
 
     # --- ATTRIBUTION (bottom right) ---
     if FONTS:
-        font_attr = FontProperties(fname=FONTS["light"], size=8)
+        font_attr = get_font_properties(fname=FONTS["light"], size=BASE_ATTR)
     else:
-        font_attr = FontProperties(family="monospace", size=8)
+        font_attr = get_font_properties(family="monospace", size=BASE_ATTR)
 
     ax.text(
         0.98,
@@ -804,7 +1072,8 @@ def create_poster(
 
     # DPI matters mainly for raster formats
     if fmt == "png":
-        save_kwargs["dpi"] = 300
+        save_kwargs["dpi"] = dpi
+        save_kwargs["pil_kwargs"] = {"compress_level": PNG_COMPRESS_LEVEL, "optimize": False}
 
     plt.savefig(output_file, format=fmt, **save_kwargs)
 
@@ -812,6 +1081,63 @@ def create_poster(
     print(f"[OK] Done! Poster saved as {output_file}")
 
 
+def render_theme(theme_name, coords, fonts, layers):
+    """
+    Load one theme and render the poster for the current CLI arguments.
+
+    Args:
+        theme_name: Theme file name without extension
+        coords: (latitude, longitude) of the map center
+        fonts: Fonts from load_fonts, or None for the defaults
+        layers: Prepared layers from prepare_layers
+
+    Returns:
+        Path of the saved poster
+    """
+    global THEME
+    THEME = load_theme(theme_name)
+    output_file = generate_output_filename(args.city, theme_name, args.format)
+    create_poster(
+        args.city,
+        args.country,
+        coords,
+        args.distance,
+        output_file,
+        args.format,
+        args.width,
+        args.height,
+        display_city=args.display_city,
+        display_country=args.display_country,
+        fonts=fonts,
+        dpi=args.dpi,
+        layers=layers,
+    )
+    return output_file
+
+
+_worker_layers = None
+
+
+def _init_render_worker(cli_args, layers):
+    """
+    Process-pool initializer for --all-themes rendering.
+
+    Each worker receives the CLI arguments and the prepared layers once,
+    rather than once per theme, and never opens a window. The inherited
+    SQLite handle is dropped so the worker opens its own connection.
+    """
+    global args, _worker_layers, _cache_db, _cache_lock
+    matplotlib.use("Agg")
+    args = cli_args
+    _worker_layers = layers
+    _cache_db = None
+    _cache_lock = threading.Lock()
+
+
+def _render_theme_in_worker(theme_name, coords, fonts):
+    return render_theme(theme_name, coords, fonts, _worker_layers)
+
+
 def print_examples():
     """Print usage examples."""
     print("""
@@ -871,6 +1197,20 @@ Generated posters are saved to 'posters/' directory.
 """)
 
 
+def _read_theme_summary(theme_name):
+    """
+    Read a theme's display name and description for listing.
+    Falls back to the file name if the theme can't be read.
+    """
+    theme_path = os.path.join(THEMES_DIR, f"{theme_name}.json")
+    try:
+        with open(theme_path, "rb") as f:
+            theme_data = json_loads(f.read())
+            return theme_data.get('name', theme_name), theme_data.get('description', '')
+    except (OSError, json.JSONDecodeError):
+        return theme_name, ""
+
+
 def list_themes():
     """List all available themes with descriptions."""
     available_themes = get_available_themes()
@@ -878,18 +1218,13 @@ def list_themes():
         print("No themes found in 'themes/' directory.")
         return
 
+    # Theme files are independent small reads; overlap them
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        summaries = list(executor.map(_read_theme_summary, available_themes))
+
     print("\nAvailable Themes:")
     print("-" * 60)
-    for theme_name in available_themes:
-        theme_path = os.path.join(THEMES_DIR, f"{theme_name}.json")
-        try:
-            with open(theme_path, "r") as f:
-                theme_data = json.load(f)
-                display_name = theme_data.get('name', theme_name)
-                description = theme_data.get('description', '')
-        except (OSError, json.JSONDecodeError):
-            display_name = theme_name
-            description = ""
+    for theme_name, (display_name, description) in zip(available_themes, summaries):
         print(f"  {theme_name}")
         print(f"    {display_name}")
         if description:
@@ -897,7 +1232,58 @@ def list_themes():
         print()
 
 
-if __name__ == "__main__":
+def parse_coordinate(value):
+    """
+    argparse type for --latitude/--longitude: accepts any format that
+    lat_lon_parser understands (decimal, DMS, N/S/E/W suffixes).
+    """
+    try:
+        return parse(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def max_dimension(label, limit=20.0):
+    """
+    Build an argparse type for --width/--height that clamps oversized
+    values to the limit (with a warning) while the arguments are parsed.
+    """
+
+    def clamp(value):
+        try:
+            size = float(value)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(f"invalid float value: {value!r}") from e
+        if size > limit:
+            print(
+                f"[WARN] {label} {size} exceeds the maximum allowed limit of {limit:g}. It's enforced as max limit {limit:g}."
+            )
+            return limit
+        return size
+
+    return clamp
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv: Argument list without the program name; defaults to
+            sys.argv[1:]. Lets other front ends (e.g. the Streamlit app)
+            call the generator in-process instead of exec()ing this file.
+
+    Returns:
+        List of saved poster paths, in theme order
+
+    Raises:
+        Exception: When argv is given, a failed generation is re-raised
+            after being logged instead of exiting the caller's process
+    """
+    global args
+    from_command_line = argv is None
+    argv = sys.argv[1:] if argv is None else list(argv)
+
     parser = argparse.ArgumentParser(
         description="Generate beautiful map posters for any city",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -917,14 +1303,14 @@ Examples:
         "--latitude",
         "-lat",
         dest="latitude",
-        type=str,
+        type=parse_coordinate,
         help="Override latitude center point",
     )
     parser.add_argument(
         "--longitude",
         "-long",
         dest="longitude",
-        type=str,
+        type=parse_coordinate,
         help="Override longitude center point",
     )
     parser.add_argument(
@@ -957,21 +1343,21 @@ Examples:
     parser.add_argument(
         "--network-type",
         type=str,
-        default="drive",
-        choices=["drive", "all", "walk", "bike"],
-        help="Type of street network to download (default: drive)",
+        default="all",
+        choices=["all", "drive", "walk", "bike"],
+        help="Type of street network to download (default: all)",
     )
     parser.add_argument(
         "--width",
         "-W",
-        type=float,
+        type=max_dimension("Width"),
         default=12,
         help="Image width in inches (default: 12, max: 20 )",
     )
     parser.add_argument(
         "--height",
         "-H",
-        type=float,
+        type=max_dimension("Height"),
         default=16,
         help="Image height in inches (default: 16, max: 20)",
     )
@@ -1020,10 +1406,10 @@ Examples:
     parser.add_argument('--no-parks', action='store_true',
                        help='Hide parks/green spaces from the map')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # If no arguments provided, show examples
-    if len(sys.argv) == 1:
+    if not argv:
         print_examples()
         sys.exit(0)
 
@@ -1038,18 +1424,6 @@ Examples:
         print_examples()
         sys.exit(1)
 
-    # Enforce maximum dimensions
-    if args.width > 20:
-        print(
-            f"[WARN] Width {args.width} exceeds the maximum allowed limit of 20. It's enforced as max limit 20."
-        )
-        args.width = 20.0
-    if args.height > 20:
-        print(
-            f"[WARN] Height {args.height} exceeds the maximum allowed limit of 20. It's enforced as max limit 20."
-        )
-        args.height = 20.0
-
     available_themes = get_available_themes()
     if not available_themes:
         print("No themes found in 'themes/' directory.")
@@ -1069,45 +1443,61 @@ Examples:
     print("=" * 50)
 
     # Load custom fonts if specified
-    custom_fonts = None
-    if args.font_family:
-        custom_fonts = load_fonts(getattr(args, "font_family", None))
-        # Note: custom_fonts=None is OK - it means use system font via matplotlib
+    # Note: custom_fonts=None is OK - it means use system font via matplotlib
+    custom_fonts = load_fonts(args.font_family) if args.font_family else None
 
     # Get coordinates and generate poster
     try:
-        if args.latitude and args.longitude:
-            lat = parse(args.latitude)
-            lon = parse(args.longitude)
-            coords = [lat, lon]
+        if args.latitude is not None and args.longitude is not None:
+            coords = [args.latitude, args.longitude]
             print(f"[OK] Coordinates: {', '.join([str(i) for i in coords])}")
         else:
             coords = get_coordinates(args.city, args.country)
 
-        for theme_name in themes_to_generate:
-            THEME = load_theme(theme_name)
-            output_file = generate_output_filename(args.city, theme_name, args.format)
-            create_poster(
-                args.city,
-                args.country,
-                coords,
-                args.distance,
-                output_file,
-                args.format,
-                args.width,
-                args.height,
-                display_city=args.display_city,
-                display_country=args.display_country,
-                fonts=custom_fonts,
-            )
+        # OSM data, projection and cropping do not depend on the theme, so
+        # do them once for all of them
+        compensated_dist = get_compensated_dist(args.distance, args.width, args.height)
+        map_data = fetch_map_data(
+            coords,
+            compensated_dist,
+            network_type=args.network_type,
+            no_water=args.no_water,
+            no_parks=args.no_parks,
+        )
+        layers = prepare_layers(map_data, coords, args.width, args.height, compensated_dist)
+        del map_data
+
+        if len(themes_to_generate) == 1:
+            posters = [render_theme(themes_to_generate[0], coords, custom_fonts, layers)]
+        else:
+            # Themes render independently from the same data, so use one
+            # process per core instead of drawing them one after another
+            workers = min(len(themes_to_generate), os.cpu_count() or 1)
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_render_worker,
+                initargs=(args, layers),
+            ) as executor:
+                render = partial(_render_theme_in_worker, coords=coords, fonts=custom_fonts)
+                posters = list(executor.map(render, themes_to_generate, chunksize=1))
 
         print("\n" + "=" * 50)
         print("[OK] Poster generation complete!")
         print("=" * 50)
+        return posters
 
     except Exception as e:
         print(f"\n[FAIL] Error: {e}")
         import traceback
 
         traceback.print_exc()
+        if not from_command_line:
+            raise
         sys.exit(1)
+
+
+if __name__ == "__main__":
+    # Frozen (PyInstaller) builds re-run this block in every --all-themes
+    # render worker; this hands those processes to multiprocessing instead
+    multiprocessing.freeze_support()
+    main()
@@ -12,6 +12,11 @@ from typing import Optional
 FONTS_DIR = "fonts"
 FONTS_CACHE_DIR = Path(FONTS_DIR) / "cache"
 
+# Families whose every weight downloaded, so a long-running process (the
+# web app) skips the Google Fonts CSS request on repeat generations;
+# failed or partial downloads are not kept and get retried next time
+_downloaded_fonts: dict = {}
+
 
 def download_google_font(font_family: str, weights: list = None) -> Optional[dict]:
     """
@@ -25,6 +30,10 @@ def download_google_font(font_family: str, weights: list = None) -> Optional[dic
     if weights is None:
         weights = [300, 400, 700]
 
+    key = (font_family, tuple(weights))
+    if key in _downloaded_fonts:
+        return dict(_downloaded_fonts[key])
+
     # Create fonts cache directory
     FONTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -32,6 +41,7 @@ def download_google_font(font_family: str, weights: list = None) -> Optional[dic
     font_name_safe = font_family.replace(" ", "_").lower()
 
     font_files = {}
+    complete = True
 
     try:
         # Google Fonts API endpoint - request all weights at once
@@ -106,6 +116,7 @@ def download_google_font(font_family: str, weights: list = None) -> Optional[dic
                         font_path.write_bytes(font_response.content)
                     except Exception as e:
                         print(f"  [WARN] Failed to download {weight_key}: {e}")
+                        complete = False
                         continue
                 else:
                     print(f"  Using cached {font_family} {weight_key}")
@@ -126,6 +137,8 @@ def download_google_font(font_family: str, weights: list = None) -> Optional[dic
             font_files["light"] = font_files["regular"]
             print(f"  Using regular weight as light")
 
+        if font_files and complete:
+            _downloaded_fonts[key] = dict(font_files)
         return font_files if font_files else None
 
     except Exception as e:
@@ -5,10 +5,20 @@ Simplified version with fixed DPI and limited distance
 """
 
 import streamlit as st
-import sys
 import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
-from io import StringIO
+from io import BytesIO
+
+from PIL import Image
+
+import create_map_poster
 
 # Page config
 st.set_page_config(
@@ -30,6 +40,189 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Sidebar choices, built once per process rather than on every rerun
+THEMES = (
+    "gradient_roads", "contrast_zones", "noir",
+    "midnight_blue", "blueprint", "neon_cyberpunk", "warm_beige",
+    "pastel_dream", "japanese_ink", "forest", "ocean",
+    "terracotta", "sunset", "autumn", "copper_patina", "monochrome_blue"
+)
+NETWORK_TYPES = ("all", "drive", "walk", "bike")
+SIZE_MAP = {
+    "Poster (12x16)": (12, 16),
+    "A4 Print (8.3x11.7)": (8.3, 11.7),
+    "4K Wallpaper (12.8x7.2)": (12.8, 7.2),
+    "HD Wallpaper (6.4x3.6)": (6.4, 3.6),
+    "Mobile Portrait (3.6x6.4)": (3.6, 6.4),
+    "Instagram Square (3.6x3.6)": (3.6, 3.6)
+}
+SIZE_PRESETS = ("Custom", *SIZE_MAP)
+
+# Log parsing patterns, compiled once instead of on every stdout write
+ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+# Generator log phrases -> (progress %, status text)
+MILESTONES = {
+    "Looking up coordinates": (10, "📍 Looking up location..."),
+    "street network": (30, "🛣️ Downloading street network..."),
+    "Downloading water": (50, "💧 Downloading water features..."),
+    "water features": (50, "💧 Downloading water features..."),
+    "Downloading parks": (70, "🌳 Downloading parks..."),
+    "green spaces": (70, "🌳 Downloading parks..."),
+    "Rendering map": (85, "🎨 Rendering map..."),
+    "Creating poster": (85, "🎨 Rendering map..."),
+    "Applying": (85, "🎨 Rendering map..."),
+    "Poster saved": (100, "✅ Complete!"),
+    "Done!": (100, "✅ Complete!"),
+}
+MILESTONE_PATTERN = re.compile("|".join(map(re.escape, MILESTONES)))
+
+# Minimum seconds between log re-renders; each one ships the whole log
+# to the browser, and tqdm alone writes dozens of updates per second
+LOG_REFRESH_INTERVAL = 0.1
+
+# Number of log lines kept and shown in the generation log
+LOG_LINES_SHOWN = 50
+
+# Generator output line naming a saved poster
+POSTER_SAVED = re.compile(r"Poster saved as (.+)$")
+
+# Sessions that find the in-process generator busy run the CLI in their
+# own interpreter instead of queueing; this caps how many do at once
+MAX_SUBPROCESS_GENERATIONS = 2
+
+# Identical settings always produce the same poster, so keep the files
+# of recent renders around and hand them back instead of re-rendering
+MAX_CACHED_POSTERS = 32
+
+
+@st.cache_resource
+def rendered_posters():
+    """
+    Generated poster paths keyed by generator arguments, shared by all
+    sessions, with the lock that guards them.
+    """
+    return OrderedDict(), threading.Lock()
+
+
+def find_rendered_poster(key):
+    posters, lock = rendered_posters()
+    with lock:
+        path = posters.get(key)
+        if path is None or not path.exists():
+            return None
+        posters.move_to_end(key)
+        return path
+
+
+@st.cache_resource
+def generation_lock():
+    """
+    One in-process generation at a time: the generator keeps its CLI
+    arguments and theme in module globals, draws through pyplot and logs
+    to the process-wide stdout, so two sessions would clobber each other.
+    """
+    return threading.Lock()
+
+
+@st.cache_resource
+def subprocess_slots():
+    """Bounds the generations running in subprocesses at any one time."""
+    return threading.BoundedSemaphore(MAX_SUBPROCESS_GENERATIONS)
+
+
+def run_generator_in_process(argv, writer):
+    """
+    Run the already-imported generator with its output going to writer.
+    The caller must hold generation_lock().
+    """
+    with redirect_stdout(writer), redirect_stderr(writer):
+        try:
+            return create_map_poster.main(argv)
+        finally:
+            # Show whatever other threads or the last batch held back
+            writer.flush()
+            writer.render_log()
+
+
+def run_generator_subprocess(argv, writer):
+    """
+    Run the generator CLI in a fresh interpreter, feeding its output to
+    writer as it arrives. Nothing is shared with other sessions, at the
+    cost of importing the generator's dependencies again.
+
+    Returns:
+        Saved poster paths, in order
+
+    Raises:
+        SystemExit: With the CLI's exit status if it failed, like an
+            in-process generation that exits
+    """
+    posters = []
+    process = subprocess.Popen(
+        [sys.executable, "-u", create_map_poster.__file__, *argv],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        env={**os.environ, "PYTHONIOENCODING": "utf-8"},
+    )
+    try:
+        for line in process.stdout:
+            writer.write(line)
+            saved = POSTER_SAVED.search(line)
+            if saved:
+                posters.append(saved.group(1).strip())
+        process.wait()
+    finally:
+        # The session may stop mid-run (rerun or closed tab)
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        writer.render_log()
+    if process.returncode:
+        raise SystemExit(process.returncode)
+    return posters
+
+
+def remember_poster(key, path):
+    posters, lock = rendered_posters()
+    with lock:
+        posters[key] = path
+        posters.move_to_end(key)
+        while len(posters) > MAX_CACHED_POSTERS:
+            posters.popitem(last=False)
+
+
+@st.cache_resource(show_spinner=False)
+def warm_up_generator():
+    """
+    Import the generator's heavy dependencies once per server process.
+    create_map_poster defers them to keep the CLI's --help fast, which
+    would otherwise leave their cost to the first Generate click.
+    Posters render off the main thread without a display, so Agg is
+    selected before pyplot picks a GUI backend.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    # Imported only to load them into sys.modules ahead of the first click
+    import matplotlib.pyplot  # noqa: F401
+    import osmnx  # noqa: F401
+
+
+@st.cache_data(max_entries=MAX_CACHED_POSTERS, show_spinner=False)
+def poster_preview(poster_bytes):
+    """
+    WebP copy of a poster for the on-page preview. It is several times
+    smaller than the PNG, which only the download button still serves.
+    """
+    with Image.open(BytesIO(poster_bytes)) as image:
+        buffer = BytesIO()
+        image.save(buffer, "WEBP", quality=88, method=4)
+    return buffer.getvalue()
+
+
 # Title
 st.title("🗺 Cyanidesugar's Map Studio")
 st.markdown("Create beautiful, minimalist map posters")
@@ -41,76 +234,63 @@ with st.sidebar:
     # Location
     location_mode = st.radio("Location Input", ["City & Country", "Coordinates"])
     
-    if location_mode == "City & Country":
-        city = st.text_input("City", placeholder="Paris")
-        country = st.text_input("Country", placeholder="France")
+    # The rest is batched into one form so editing a field doesn't
+    # rerun the whole script; the location mode stays outside because
+    # it decides which fields the form shows
+    with st.form("poster_options"):
+        if location_mode == "City & Country":
+            city = st.text_input("City", placeholder="Paris")
+            country = st.text_input("Country", placeholder="France")
         
-        # Custom display names
-        with st.expander("Custom Display Names (Optional)"):
-            st.caption("Override the text shown on the poster")
-            display_city = st.text_input("Custom City Name", placeholder="Leave blank to use actual name")
-            display_country = st.text_input("Custom Country Name", placeholder="Leave blank to use actual name")
-    else:
-        latitude = st.number_input("Latitude", -90.0, 90.0, 48.8566, format="%.4f")
-        longitude = st.number_input("Longitude", -180.0, 180.0, 2.3522, format="%.4f")
-        city = "Custom"
-        country = "Location"
-        display_city = None
-        display_country = None
+            # Custom display names
+            with st.expander("Custom Display Names (Optional)"):
+                st.caption("Override the text shown on the poster")
+                display_city = st.text_input("Custom City Name", placeholder="Leave blank to use actual name")
+                display_country = st.text_input("Custom Country Name", placeholder="Leave blank to use actual name")
+        else:
+            latitude = st.number_input("Latitude", -90.0, 90.0, 48.8566, format="%.4f")
+            longitude = st.number_input("Longitude", -180.0, 180.0, 2.3522, format="%.4f")
+            city = "Custom"
+            country = "Location"
+            display_city = None
+            display_country = None
     
-    # Design
-    st.subheader("Map Design")
-    theme = st.selectbox("Theme", [
-        "gradient_roads", "contrast_zones", "noir",
-        "midnight_blue", "blueprint", "neon_cyberpunk", "warm_beige",
-        "pastel_dream", "japanese_ink", "forest", "ocean",
-        "terracotta", "sunset", "autumn", "copper_patina", "monochrome_blue"
-    ])
+        # Design
+        st.subheader("Map Design")
+        theme = st.selectbox("Theme", THEMES)
     
-    # Font selection
-    font_family = st.text_input("Font Family", placeholder="Arial, Roboto, Helvetica... (leave blank for default)")
+        # Font selection
+        font_family = st.text_input("Font Family", placeholder="Arial, Roboto, Helvetica... (leave blank for default)")
     
-    # Distance - limited to 20000
-    distance = st.slider("Radius (m)", 1000, 20000, 10000, 1000, 
-                        help="Maximum distance: 20km to optimize performance")
+        # Distance - limited to 20000
+        distance = st.slider("Radius (m)", 1000, 20000, 10000, 1000, 
+                            help="Maximum distance: 20km to optimize performance")
     
-    network_type = st.selectbox("Network Type", ["drive", "all", "walk", "bike"])
+        network_type = st.selectbox("Network Type", NETWORK_TYPES)
     
-    # Output
-    st.subheader("Output")
+        # Output
+        st.subheader("Output")
     
-    # Size presets
-    size_preset = st.selectbox("Size Preset", [
-        "Custom",
-        "Poster (12x16)",
-        "A4 Print (8.3x11.7)",
-        "4K Wallpaper (12.8x7.2)",
-        "HD Wallpaper (6.4x3.6)",
-        "Mobile Portrait (3.6x6.4)",
-        "Instagram Square (3.6x3.6)"
-    ])
+        # Size presets
+        size_preset = st.selectbox("Size Preset", SIZE_PRESETS)
     
-    if size_preset == "Custom":
-        width = st.number_input("Width (inches)", 1.0, 20.0, 12.0, 0.1)
-        height = st.number_input("Height (inches)", 1.0, 20.0, 16.0, 0.1)
-    else:
-        size_map = {
-            "Poster (12x16)": (12, 16),
-            "A4 Print (8.3x11.7)": (8.3, 11.7),
-            "4K Wallpaper (12.8x7.2)": (12.8, 7.2),
-            "HD Wallpaper (6.4x3.6)": (6.4, 3.6),
-            "Mobile Portrait (3.6x6.4)": (3.6, 6.4),
-            "Instagram Square (3.6x3.6)": (3.6, 3.6)
-        }
-        width, height = size_map[size_preset]
+        # Form widgets only report back on submit, so the custom size fields
+        # can't appear on demand; they are always shown and used for "Custom"
+        width = st.number_input("Custom Width (inches)", 1.0, 20.0, 12.0, 0.1)
+        height = st.number_input("Custom Height (inches)", 1.0, 20.0, 16.0, 0.1)
     
-    st.info("DPI: Fixed at 72 for web optimization")
+        st.info("DPI: Fixed at 72 for web optimization")
     
-    # Features
-    st.subheader("Features")
-    show_roads = st.checkbox("Roads", value=True)
-    show_water = st.checkbox("Water", value=True)
-    show_parks = st.checkbox("Parks", value=True)
+        # Features
+        st.subheader("Features")
+        show_roads = st.checkbox("Roads", value=True)
+        show_water = st.checkbox("Water", value=True)
+        show_parks = st.checkbox("Parks", value=True)
+
+        submitted = st.form_submit_button("Generate Poster", type="primary", use_container_width=True)
+
+if size_preset != "Custom":
+    width, height = SIZE_MAP[size_preset]
 
 # Main
 if location_mode == "City & Country":
@@ -121,7 +301,10 @@ if location_mode == "City & Country":
 else:
     st.info(f"Coordinates: {latitude}, {longitude}")
 
-if st.button("Generate Poster", type="primary", use_container_width=True):
+# After the page has been drawn so the first visit isn't held up
+warm_up_generator()
+
+if submitted:
     if location_mode == "City & Country" and (not city or not country):
         st.error("Please provide city and country")
     else:
@@ -166,27 +349,33 @@ if st.button("Generate Poster", type="primary", use_container_width=True):
                     args.append("--no-parks")
                 
                 # Execute
-                original_argv = sys.argv[:]
-                original_stdout = sys.stdout
-                original_stderr = sys.stderr
-                
                 # Track progress based on output
                 class ProgressWriter:
                     def __init__(self):
-                        self.buffer = ""
                         self.progress = 0
-                        self.log_lines = []
+                        self.log_lines = deque(maxlen=LOG_LINES_SHOWN)
+                        self.log_dirty = False
+                        self.last_render = 0.0
+                        # Streamlit elements may only be updated from the
+                        # script thread; writes from other threads (library
+                        # warnings on the fetch pool) wait here until then
+                        self.script_thread = threading.current_thread()
+                        self.pending = deque()
                     
                     def write(self, text):
                         if not text:
                             return
-                        
-                        self.buffer += text
-                        
+                        if threading.current_thread() is not self.script_thread:
+                            self.pending.append(text)
+                            return
+                        self.flush()
+                        self.consume(text)
+                    
+                    def consume(self, text):
                         # Add to log display (filter out progress bars)
-                        import re
-                        # Remove ANSI codes
-                        clean_text = re.sub(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])', '', text)
+                        # Remove ANSI codes; most writes have none, and the
+                        # substring test is far cheaper than a regex scan
+                        clean_text = ANSI_ESCAPE.sub('', text) if '\x1b' in text else text
                         clean_text = clean_text.replace('\r', '\n')
                         
                         # Filter progress bars
@@ -195,82 +384,94 @@ if st.button("Generate Poster", type="primary", use_container_width=True):
                                 # Skip lines with lots of # characters (progress bars)
                                 if line.count('#') < 10 and line.count('█') < 10:
                                     self.log_lines.append(line)
-                                    # Update log display
-                                    log_text.code('\n'.join(self.log_lines[-50:]))  # Show last 50 lines
+                                    self.log_dirty = True
                         
                         # Update progress based on key milestones
-                        if "Looking up coordinates" in text:
-                            self.progress = 10
-                            status_text.text("📍 Looking up location...")
-                            progress_bar.progress(self.progress)
-                        elif "Downloading street network" in text or "street network" in text:
-                            self.progress = 30
-                            status_text.text("🛣️ Downloading street network...")
-                            progress_bar.progress(self.progress)
-                        elif "Downloading water" in text or "water features" in text:
-                            self.progress = 50
-                            status_text.text("💧 Downloading water features...")
-                            progress_bar.progress(self.progress)
-                        elif "Downloading parks" in text or "green spaces" in text:
-                            self.progress = 70
-                            status_text.text("🌳 Downloading parks...")
-                            progress_bar.progress(self.progress)
-                        elif "Rendering map" in text or "Creating poster" in text or "Applying" in text:
-                            self.progress = 85
-                            status_text.text("🎨 Rendering map...")
-                            progress_bar.progress(self.progress)
-                        elif "Poster saved" in text or "Done!" in text:
-                            self.progress = 100
-                            status_text.text("✅ Complete!")
-                            progress_bar.progress(self.progress)
+                        milestone = MILESTONE_PATTERN.search(text)
+                        if milestone:
+                            self.advance(*MILESTONES[milestone.group()])
+                        
+                        # Update log display, batched except at milestones
+                        if milestone or time.monotonic() - self.last_render >= LOG_REFRESH_INTERVAL:
+                            self.render_log()
+                    
+                    def render_log(self):
+                        if not self.log_dirty:
+                            return
+                        log_text.code('\n'.join(self.log_lines))
+                        self.log_dirty = False
+                        self.last_render = time.monotonic()
+                    
+                    def advance(self, progress, status):
+                        # Roads, water and parks download in parallel and can
+                        # finish in any order, so never move the bar backwards
+                        if progress <= self.progress:
+                            return
+                        self.progress = progress
+                        status_text.text(status)
+                        progress_bar.progress(self.progress)
                     
                     def flush(self):
-                        pass
+                        if threading.current_thread() is not self.script_thread:
+                            return
+                        while self.pending:
+                            self.consume(self.pending.popleft())
                     
                     def isatty(self):
                         return False
                 
                 progress_writer = ProgressWriter()
                 
-                try:
-                    sys.argv = ['create_map_poster.py'] + args
-                    sys.stdout = progress_writer
-                    sys.stderr = progress_writer
+                cache_key = tuple(args)
+                poster_path = find_rendered_poster(cache_key)
+                if poster_path is None:
+                    lock = generation_lock()
+                    if lock.acquire(blocking=False):
+                        try:
+                            posters = run_generator_in_process(args, progress_writer)
+                        finally:
+                            lock.release()
+                    else:
+                        # Another session is using the in-process generator
+                        slots = subprocess_slots()
+                        if not slots.acquire(blocking=False):
+                            status_text.text("⏳ Waiting for another generation to finish...")
+                            slots.acquire()
+                        try:
+                            status_text.text("🚀 Starting a separate generator...")
+                            posters = run_generator_subprocess(args, progress_writer)
+                        finally:
+                            slots.release()
                     
-                    with open('create_map_poster.py', 'r', encoding='utf-8') as f:
-                        script_code = f.read()
+                    if posters:
+                        poster_path = Path(posters[0])
+                        remember_poster(cache_key, poster_path)
+                
+                if poster_path is not None:
+                    progress_bar.progress(100)
+                    status_text.text("✅ Poster generated successfully!")
                     
-                    exec(script_code, {'__name__': '__main__', '__file__': 'create_map_poster.py', '__builtins__': __builtins__})
+                    st.success("Poster generated!")
+                    # Read once; the page shows a WebP copy and the download
+                    # button serves the original PNG
+                    poster_bytes = poster_path.read_bytes()
+                    st.image(poster_preview(poster_bytes), use_container_width=True)
                     
-                    # Find generated poster
-                    posters_dir = Path("posters")
-                    if posters_dir.exists():
-                        posters = sorted(posters_dir.glob("*.png"), key=lambda x: x.stat().st_mtime, reverse=True)
-                        if posters:
-                            poster_path = posters[0]
-                            
-                            progress_bar.progress(100)
-                            status_text.text("✅ Poster generated successfully!")
-                            
-                            st.success("Poster generated!")
-                            st.image(str(poster_path), use_container_width=True)
-                            
-                            with open(poster_path, "rb") as file:
-                                st.download_button(
-                                    "📥 Download Poster",
-                                    data=file,
-                                    file_name=poster_path.name,
-                                    mime="image/png",
-                                    use_container_width=True
-                                )
-                        else:
-                            st.error("No poster generated")
-                
-                finally:
-                    sys.argv = original_argv
-                    sys.stdout = original_stdout
-                    sys.stderr = original_stderr
+                    st.download_button(
+                        "📥 Download Poster",
+                        data=poster_bytes,
+                        file_name=poster_path.name,
+                        mime="image/png",
+                        use_container_width=True
+                    )
+                else:
+                    st.error("No poster generated")
                 
+            except SystemExit:
+                # The generator rejected its arguments and said why in the log
+                lines = progress_writer.log_lines
+                reason = next((line for line in reversed(lines) if "error" in line.lower()), lines[-1] if lines else "")
+                st.error(f"Generation failed: {reason.strip() or 'see the generation log'}")
             except Exception as e:
                 st.error(f"Error: {str(e)}")
 